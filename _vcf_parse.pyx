@@ -0,0 +1,418 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Typed VCF record reader that calls htslib directly.
+
+This skips pysam's per-record Python objects: records are iterated as
+``bcf1_t*`` and INFO/FORMAT values are pulled with htslib's typed accessors
+(``bcf_get_info_*``/``bcf_get_format_*``). Scalar Integer, Float and Flag
+fields are written into NumPy buffers; vector and String fields are collected
+as Python lists.
+
+The module links against the htslib bundled with pysam. ``simplevcf`` builds
+it with ``pyximport`` the first time it is imported (see
+``_vcf_parse.pyxbld``); it can also be built ahead of time with
+``cythonize``.
+"""
+import numpy as np
+
+from libc.stdint cimport int32_t, uint8_t
+from libc.stdlib cimport free
+from pysam.libchtslib cimport (
+    BCF_DT_ID,
+    BCF_DT_SAMPLE,
+    BCF_UN_ALL,
+    BCF_UN_SHR,
+    bcf1_t,
+    bcf_float_is_missing,
+    bcf_float_is_vector_end,
+    bcf_get_format_float,
+    bcf_get_format_int32,
+    bcf_get_format_string,
+    bcf_get_genotypes,
+    bcf_get_info_flag,
+    bcf_get_info_float,
+    bcf_get_info_int32,
+    bcf_get_info_string,
+    bcf_gt_allele,
+    bcf_gt_is_missing,
+    bcf_gt_is_phased,
+    bcf_hdr_id2int,
+    bcf_hdr_int2id,
+    bcf_hdr_nsamples,
+    bcf_hdr_set_samples,
+    bcf_hdr_t,
+    bcf_int32_missing,
+    bcf_int32_vector_end,
+    bcf_seqname,
+    bcf_unpack,
+)
+
+
+cdef extern from "htslib/synced_bcf_reader.h" nogil:
+    ctypedef struct bcf_srs_t:
+        pass
+
+    bcf_srs_t *bcf_sr_init()
+    void bcf_sr_destroy(bcf_srs_t *readers)
+    int bcf_sr_set_regions(bcf_srs_t *readers, const char *regions, int is_file)
+    int bcf_sr_set_threads(bcf_srs_t *readers, int n_threads)
+    int bcf_sr_add_reader(bcf_srs_t *readers, const char *fname)
+    int bcf_sr_next_line(bcf_srs_t *readers)
+    bcf1_t *bcf_sr_get_line(bcf_srs_t *readers, int i)
+    bcf_hdr_t *bcf_sr_get_header(bcf_srs_t *readers, int i)
+
+
+# Value kinds, from the VCF header Type
+cdef enum:
+    KIND_INTEGER
+    KIND_FLOAT
+    KIND_STRING
+    KIND_FLAG
+    KIND_BOOL  # stored as 0/1 with a separate validity mask
+
+cdef dict KINDS = {
+    "Integer": KIND_INTEGER,
+    "Float": KIND_FLOAT,
+    "String": KIND_STRING,
+    "Flag": KIND_FLAG,
+}
+
+
+cdef class _ScalarColumn:
+    """Growable typed buffer with a validity mask for scalar numeric fields."""
+
+    cdef int kind
+    cdef object data
+    cdef object valid
+    cdef int32_t[::1] ints
+    cdef float[::1] floats
+    cdef uint8_t[::1] valids
+
+    def __init__(self, int kind, Py_ssize_t capacity):
+        self.kind = kind
+        self._allocate(capacity)
+
+    cdef _allocate(self, Py_ssize_t capacity):
+        if self.kind == KIND_FLOAT:
+            data = np.empty(capacity, dtype=np.float32)
+            if self.data is not None:
+                data[: len(self.data)] = self.data
+            self.floats = data
+        else:
+            data = np.empty(capacity, dtype=np.int32)
+            if self.data is not None:
+                data[: len(self.data)] = self.data
+            self.ints = data
+        valid = np.zeros(capacity, dtype=np.uint8)
+        if self.valid is not None:
+            valid[: len(self.valid)] = self.valid
+        self.valids = valid
+        self.data = data
+        self.valid = valid
+
+    cdef void grow(self, Py_ssize_t capacity):
+        self._allocate(capacity)
+
+    cdef object finish(self, Py_ssize_t n):
+        valid = self.valid[:n].astype(bool)
+        if self.kind == KIND_FLAG:
+            return np.ma.masked_array(valid, mask=~valid)
+        if self.kind == KIND_BOOL:
+            return np.ma.masked_array(self.data[:n].astype(bool), mask=~valid)
+        return np.ma.masked_array(self.data[:n], mask=~valid)
+
+
+cdef inline bint _is_vector(number):
+    return str(number) not in ("0", "1")
+
+
+cdef object _int_values(int32_t *values, int n):
+    out = []
+    cdef int i
+    for i in range(n):
+        if values[i] == bcf_int32_vector_end:
+            break
+        out.append(None if values[i] == bcf_int32_missing else values[i])
+    return out
+
+
+cdef object _float_values(float *values, int n):
+    out = []
+    cdef int i
+    for i in range(n):
+        if bcf_float_is_vector_end(values[i]):
+            break
+        out.append(None if bcf_float_is_missing(values[i]) else values[i])
+    return out
+
+
+cdef object _string_value(const char *value, int n, bint is_vector):
+    if n <= 0 or value[0] == 0:
+        return None
+    # Like pysam, "." is kept as is
+    s = value[:n].split(b"\0", 1)[0].decode()
+    return s.split(",") if is_vector else s
+
+
+def _read_vcf_chunk_c(
+    str path,
+    region,
+    list info_spec,
+    list fmt_spec,
+    list samples,
+    int threads=1,
+    int initial_capacity=65536,
+):
+    """
+    Read a VCF (or a region of an indexed one) into typed columns.
+
+    Parameters
+    ----------
+    path : str
+        Path or URL of the VCF/BCF file.
+    region : str or None
+        htslib region string (e.g. "chr1:1000-2000"). Requires an index.
+    info_spec : list[tuple[str, number, str]]
+        (name, number, type) of the INFO fields to extract.
+    fmt_spec : list[tuple[str, number, str]]
+        (name, number, type) of the FORMAT fields to extract.
+    samples : list[str]
+        Samples to extract FORMAT fields for.
+    threads : int
+        Number of htslib threads used to decompress BGZF blocks.
+
+    Returns
+    -------
+    dict[str, np.ma.MaskedArray | list]
+        Columns keyed by the names used by simplevcf.
+    """
+    cdef bcf_srs_t *sr = bcf_sr_init()
+    cdef bcf_hdr_t *hdr
+    cdef bcf1_t *rec
+    cdef int ret, i, j, k, n, ploidy, nsmpl, unpack
+    cdef int nibuf = 0, nfbuf = 0, nsbuf = 0, nstrs = 0
+    cdef Py_ssize_t nrec = 0, capacity = initial_capacity
+    cdef int32_t *ibuf = NULL
+    cdef float *fbuf = NULL
+    cdef char *sbuf = NULL
+    cdef char **strs = NULL
+    cdef int32_t *gt
+    cdef int32_t allele
+    cdef bint unphased
+    cdef _ScalarColumn scol
+
+    if sr == NULL:
+        raise MemoryError()
+    try:
+        if region is not None:
+            if bcf_sr_set_regions(sr, region.encode(), 0) < 0:
+                raise ValueError(f"Invalid region: {region}")
+        if threads > 1 and bcf_sr_set_threads(sr, threads) < 0:
+            raise OSError("Could not set up decompression threads")
+        if not bcf_sr_add_reader(sr, path.encode()):
+            raise OSError(f"Could not open {path}")
+        hdr = bcf_sr_get_header(sr, 0)
+        # htslib is told to keep only the requested samples, so it skips
+        # parsing the FORMAT values of the others. Without any sample data
+        # to extract, it skips parsing the FORMAT columns altogether.
+        if not samples or not fmt_spec:
+            if bcf_hdr_set_samples(hdr, NULL, 0) < 0:
+                raise OSError(f"Could not drop the samples of {path}")
+            samples = []
+            fmt_spec = []
+            unpack = BCF_UN_SHR
+        else:
+            ret = bcf_hdr_set_samples(hdr, ",".join(samples).encode(), 0)
+            if ret < 0:
+                raise OSError(f"Could not subset the samples of {path}")
+            if ret > 0:
+                # The 1-based position of the first sample not in the file
+                raise KeyError(samples[ret - 1])
+            unpack = BCF_UN_ALL
+        # Sample indices and counts refer to the subsetted header
+        nsmpl = bcf_hdr_nsamples(hdr)
+
+        sample_idx = []
+        for sample in samples:
+            idx = bcf_hdr_id2int(hdr, BCF_DT_SAMPLE, sample.encode())
+            if idx < 0:
+                raise KeyError(sample)
+            sample_idx.append(idx)
+
+        cols = {
+            "chrom": [],
+            "pos": [],
+            "id": [],
+            "ref": [],
+            "alts": [],
+            "qual": [],
+            "filters": [],
+        }
+        info = []
+        for name, number, type_ in info_spec:
+            kind = KINDS[type_]
+            vector = _is_vector(number) and kind != KIND_FLAG
+            if vector or kind == KIND_STRING:
+                cols[name] = []
+            else:
+                cols[name] = _ScalarColumn(kind, capacity)
+            info.append((name.encode(), name, kind, vector))
+        fmt = []
+        for name, number, type_ in fmt_spec:
+            kind = KINDS[type_]
+            vector = _is_vector(number)
+            keys = [f"{sample}.{name}" for sample in samples]
+            phased_keys = [f"{sample}.phased" for sample in samples]
+            for key, phased_key in zip(keys, phased_keys):
+                if name == "GT":
+                    cols[key] = []
+                    cols[phased_key] = _ScalarColumn(KIND_BOOL, capacity)
+                elif vector or kind == KIND_STRING:
+                    cols[key] = []
+                else:
+                    cols[key] = _ScalarColumn(kind, capacity)
+            fmt.append((name.encode(), name, kind, vector, keys, phased_keys))
+        scalars = [c for c in cols.values() if isinstance(c, _ScalarColumn)]
+
+        while True:
+            with nogil:
+                ret = bcf_sr_next_line(sr)
+            if ret <= 0:
+                break
+            rec = bcf_sr_get_line(sr, 0)
+            bcf_unpack(rec, unpack)
+
+            if nrec == capacity:
+                capacity *= 2
+                for scol in scalars:
+                    scol.grow(capacity)
+
+            # Main fields
+            cols["chrom"].append(bcf_seqname(hdr, rec).decode())
+            cols["pos"].append(rec.pos + 1)
+            id_ = rec.d.id.decode()
+            cols["id"].append(None if id_ == "." else id_)
+            cols["ref"].append(rec.d.allele[0].decode())
+            cols["alts"].append(
+                [rec.d.allele[i].decode() for i in range(1, rec.n_allele)]
+            )
+            cols["qual"].append(None if bcf_float_is_missing(rec.qual) else rec.qual)
+            cols["filters"].append(
+                [bcf_hdr_int2id(hdr, BCF_DT_ID, rec.d.flt[i]).decode()
+                 for i in range(rec.d.n_flt)]
+            )
+
+            # Info
+            for tag, name, kind, vector in info:
+                col = cols[name]
+                if kind == KIND_FLAG:
+                    scol = col
+                    scol.valids[nrec] = bcf_get_info_flag(hdr, rec, tag, NULL, NULL) == 1
+                elif kind == KIND_INTEGER:
+                    n = bcf_get_info_int32(hdr, rec, tag, &ibuf, &nibuf)
+                    if vector:
+                        col.append(_int_values(ibuf, n) if n > 0 else None)
+                    else:
+                        scol = col
+                        if n > 0 and ibuf[0] != bcf_int32_missing:
+                            scol.ints[nrec] = ibuf[0]
+                            scol.valids[nrec] = 1
+                        else:
+                            scol.valids[nrec] = 0
+                elif kind == KIND_FLOAT:
+                    n = bcf_get_info_float(hdr, rec, tag, &fbuf, &nfbuf)
+                    if vector:
+                        col.append(_float_values(fbuf, n) if n > 0 else None)
+                    else:
+                        scol = col
+                        if n > 0 and not bcf_float_is_missing(fbuf[0]):
+                            scol.floats[nrec] = fbuf[0]
+                            scol.valids[nrec] = 1
+                        else:
+                            scol.valids[nrec] = 0
+                else:
+                    n = bcf_get_info_string(hdr, rec, tag, &sbuf, &nsbuf)
+                    col.append(_string_value(sbuf, n, vector) if n > 0 else None)
+
+            # Samples
+            for tag, name, kind, vector, keys, phased_keys in fmt:
+                if name == "GT":
+                    n = bcf_get_genotypes(hdr, rec, &ibuf, &nibuf)
+                    ploidy = n // nsmpl if n > 0 else 0
+                    for j, key, phased_key in zip(sample_idx, keys, phased_keys):
+                        scol = cols[phased_key]
+                        if ploidy == 0:
+                            cols[key].append(None)
+                            scol.valids[nrec] = 0
+                            continue
+                        # Like pysam, a genotype is phased if every allele
+                        # after the first is phased, called or not.
+                        gt = ibuf + j * ploidy
+                        alleles = []
+                        unphased = False
+                        for k in range(ploidy):
+                            allele = gt[k]
+                            if allele == bcf_int32_vector_end:
+                                break
+                            if k and not bcf_gt_is_phased(allele):
+                                unphased = True
+                            if bcf_gt_is_missing(allele):
+                                alleles.append(None)
+                            else:
+                                alleles.append(bcf_gt_allele(allele))
+                        cols[key].append(alleles)
+                        scol.ints[nrec] = not unphased
+                        scol.valids[nrec] = 1
+                elif kind == KIND_INTEGER:
+                    n = bcf_get_format_int32(hdr, rec, tag, &ibuf, &nibuf)
+                    k = n // nsmpl if n > 0 else 0
+                    for j, key in zip(sample_idx, keys):
+                        col = cols[key]
+                        if vector:
+                            col.append(_int_values(ibuf + j * k, k) if k else None)
+                        else:
+                            scol = col
+                            if k and ibuf[j * k] != bcf_int32_missing:
+                                scol.ints[nrec] = ibuf[j * k]
+                                scol.valids[nrec] = 1
+                            else:
+                                scol.valids[nrec] = 0
+                elif kind == KIND_FLOAT:
+                    n = bcf_get_format_float(hdr, rec, tag, &fbuf, &nfbuf)
+                    k = n // nsmpl if n > 0 else 0
+                    for j, key in zip(sample_idx, keys):
+                        col = cols[key]
+                        if vector:
+                            col.append(_float_values(fbuf + j * k, k) if k else None)
+                        else:
+                            scol = col
+                            if k and not bcf_float_is_missing(fbuf[j * k]):
+                                scol.floats[nrec] = fbuf[j * k]
+                                scol.valids[nrec] = 1
+                            else:
+                                scol.valids[nrec] = 0
+                else:
+                    # The strings are freed and reallocated on every call
+                    nstrs = 0
+                    n = bcf_get_format_string(hdr, rec, tag, &strs, &nstrs)
+                    k = nstrs // nsmpl if n > 0 else 0
+                    for j, key in zip(sample_idx, keys):
+                        cols[key].append(
+                            _string_value(strs[j], k, vector) if k else None
+                        )
+                    if n > 0:
+                        free(strs[0])
+                        free(strs)
+                        strs = NULL
+
+            nrec += 1
+    finally:
+        free(ibuf)
+        free(fbuf)
+        free(sbuf)
+        bcf_sr_destroy(sr)
+
+    for name, col in cols.items():
+        if isinstance(col, _ScalarColumn):
+            cols[name] = (<_ScalarColumn>col).finish(nrec)
+    return cols
@@ -1,23 +1,59 @@
 from __future__ import annotations
-from typing import Any
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from itertools import islice, repeat
+from typing import Any, Callable, Iterator
+import os
 
 import numpy as np
 import oxbow as ox
 import pandas as pd
 import polars as pl
 import pyarrow as pa
+import pyarrow.compute as pc
 import pysam
 import bioframe
 
+try:
+    from _vcf_parse import _read_vcf_chunk_c
+except ImportError:
+    # Build the extension on first import. This needs Cython and a C
+    # compiler; without them the pysam reader is used instead.
+    try:
+        import pyximport
+
+        importers = pyximport.install(language_level=3)
+        try:
+            from _vcf_parse import _read_vcf_chunk_c
+        finally:
+            pyximport.uninstall(*importers)
+    except Exception:
+        _read_vcf_chunk_c = None
+
 
 # Maps the VCF-derived input types to numpy/pandas dtypes
 TYPE_MAP = {
-    "Integer": "int64",
+    "Integer": "int32",
     "Float": "float64",
     "String": "object",
     "Flag": "bool",
 }
 
+# Narrower integer dtypes for FORMAT fields whose values conventionally fit
+# them. Values that don't fit fall back to int32.
+FORMAT_INT_DTYPES = {
+    "GT": "int8",
+    "GQ": "int8",
+    "DP": "int16",
+}
+
+# Default number of htslib threads used to inflate BGZF blocks
+DEFAULT_DECOMPRESSION_THREADS = min(4, os.cpu_count() or 1)
+
+# Fixed VCF fields, in output order
+MAIN_COLUMNS = ["chrom", "pos", "id", "ref", "alts", "qual", "filters"]
+
 
 def _read_info_schema(f: pysam.VariantFile) -> pd.DataFrame:
     return pd.DataFrame(
@@ -39,62 +75,739 @@ def _read_sample_schema(f: pysam.VariantFile) -> pd.DataFrame:
     )
 
 
-def _read_vcf_as_records(
-    f: pysam.VariantFile,
+@lru_cache(maxsize=32)
+def _load_header(
+    path: str, mtime: float | None
+) -> tuple[pd.DataFrame, pd.DataFrame, tuple[str, ...]]:
+    # `mtime` is only part of the cache key, so an edited file is re-read
+    with pysam.VariantFile(path) as f:
+        return (
+            _read_info_schema(f),
+            _read_sample_schema(f),
+            tuple(f.header.samples),
+        )
+
+
+def _cached_header(
+    path: str,
+) -> tuple[pd.DataFrame, pd.DataFrame, tuple[str, ...]]:
+    # Callers must not modify the returned schemas
+    if os.path.exists(path):
+        return _load_header(path, os.path.getmtime(path))
+    # Remote files have no mtime to tell when the cached header is stale
+    return _load_header.__wrapped__(path, None)
+
+
+# Largest end coordinate a tabix index can address. oxbow rejects regions
+# ending past it on tabix-indexed files, where htslib clamps them instead.
+TABIX_MAX_END = 2**29 - 1
+
+# Renames from oxbow's VCF column names to the ones produced by the pysam reader
+OXBOW_COLUMN_MAP = {
+    "alt": "alts",
+    "filter": "filters",
+}
+
+
+def _is_projection(
+    info_schema: pd.DataFrame,
+    sample_schema: pd.DataFrame,
+    info_fields: list[str],
+    sample_fields: list[str],
+    samples: list[str],
+    all_samples: list[str],
+    include_unspecified: bool,
+) -> bool:
+    # oxbow and the htslib reader can only project fields and samples that are
+    # declared in the header, and can't pick up undeclared ones for
+    # `include_unspecified`.
+    return (
+        not include_unspecified
+        and set(info_fields) <= set(info_schema["name"])
+        and set(sample_fields) <= set(sample_schema["name"])
+        and set(samples) <= set(all_samples)
+    )
+
+
+def _oxbow_phased(gt: pa.ChunkedArray) -> pa.ChunkedArray:
+    return pa.chunked_array(
+        [_oxbow_phased_chunk(chunk) for chunk in gt.chunks], pa.bool_()
+    )
+
+
+def _oxbow_phased_chunk(gt: pa.StructArray) -> pa.Array:
+    # oxbow keeps a phasing flag per allele. Like pysam, a genotype counts as
+    # phased if every allele after the first is phased (so haploid calls are
+    # always phased).
+    alleles, phased = gt.flatten()
+    parents = pc.list_parent_indices(phased).to_numpy()
+    is_phased = pc.list_flatten(phased).fill_null(False)
+    is_phased = is_phased.to_numpy(zero_copy_only=False)
+    first = np.arange(len(parents)) == phased.offsets.to_numpy()[parents]
+    unphased = np.bincount(parents[~first & ~is_phased], minlength=len(gt)) > 0
+    return pa.array(~unphased, mask=pc.is_null(gt).to_numpy(zero_copy_only=False))
+
+
+def _flatten_oxbow_table(
+    tbl: pa.Table, samples: list[str], types: dict[str, pa.DataType]
+) -> pa.Table:
+    columns = {}
+    # Columns are kept chunked as read, so no column is copied just to be
+    # made contiguous.
+    for name, col in zip(tbl.column_names, tbl.columns):
+        if name == "info":
+            for field, values in zip(col.type, col.flatten()):
+                columns[field.name] = values
+        elif name in samples:
+            for field, values in zip(col.type, col.flatten()):
+                if field.name == "GT":
+                    # A "." call and an absent GT are both null here, so a
+                    # missing haploid call can't be given pysam's [None] and
+                    # phased=True
+                    columns[f"{name}.GT"] = pc.struct_field(values, "allele")
+                    columns[f"{name}.phased"] = _oxbow_phased(values)
+                else:
+                    columns[f"{name}.{field.name}"] = values
+        elif name == "id":
+            # pysam joins multiple IDs with ";" and returns None for "."
+            ids = pc.binary_join(col, ";")
+            columns[name] = pc.if_else(
+                pc.equal(ids, ""), pa.scalar(None, pa.string()), ids
+            )
+        elif name == "filter":
+            # oxbow returns [] for PASS and null for ".", pysam ["PASS"] and []
+            col = pc.if_else(
+                pc.equal(pc.list_value_length(col), 0),
+                pa.scalar(["PASS"], col.type),
+                col,
+            )
+            columns[OXBOW_COLUMN_MAP[name]] = col.fill_null(pa.scalar([], col.type))
+        else:
+            columns[OXBOW_COLUMN_MAP.get(name, name)] = col
+
+    for name, values in columns.items():
+        if name in types and values.type != types[name]:
+            try:
+                columns[name] = values.cast(types[name])
+            except pa.ArrowInvalid:
+                # Values too large for a narrow integer type
+                columns[name] = values.cast(_widen_type(types[name]))
+    return pa.table(columns)
+
+
+def _read_vcf_with_oxbow(
+    path: str,
     query: str | None,
-    info_fields: set[str],
-    sample_fields: set[str],
+    info_fields: list[str],
+    sample_fields: list[str],
     samples: list[str],
+    types: dict[str, pa.DataType],
+) -> pa.Table:
+    region = None
+    if query is not None:
+        # oxbow takes 1-based closed coordinates, open-ended without an end
+        chrom, start, end = bioframe.parse_region(query)
+        if end is not None:
+            region = f"{chrom}:{start + 1}-{end}"
+        elif start > 0:
+            region = f"{chrom}:{start + 1}"
+        else:
+            region = chrom
+    ipc = ox.read_vcf(
+        path,
+        region=region,
+        fields=["chrom", "pos", "id", "ref", "alt", "qual", "filter"],
+        info_fields=info_fields,
+        genotype_fields=sample_fields,
+        samples=samples,
+        compressed=path.endswith((".gz", ".bgz")),
+    )
+    tbl = pa.ipc.open_file(BytesIO(ipc)).read_all()
+    return _flatten_oxbow_table(tbl, samples, types)
+
+
+def _value_expr(vector: bool | None) -> str:
+    if vector is None:
+        return "list(v) if isinstance(v, tuple) else v"
+    if vector:
+        return "None if v is None else list(v)"
+    return "v"
+
+
+@lru_cache(maxsize=32)
+def _compile_record_extractor(
+    info_spec: tuple[tuple[str, bool, bool | None], ...],
+    sample_spec: tuple[tuple[int, str], ...],
+    fmt_spec: tuple[tuple[str, bool | None], ...],
+) -> Callable[[dict[str, list]], Callable[[pysam.VariantRecord], None]]:
+    # Generates a function that binds the column lists of a chunk and returns
+    # an extractor with every INFO/FORMAT lookup written out, so the record
+    # loop does no per-key membership tests, name building or type checks.
+    # `info_spec` holds (name, is_flag, is_vector) and `fmt_spec` holds
+    # (name, is_vector), where is_vector is None for undeclared fields.
+    names = list(MAIN_COLUMNS) + [name for name, _, _ in info_spec]
+    for _, sample in sample_spec:
+        for key, _ in fmt_spec:
+            names.append(f"{sample}.{key}")
+            if key == "GT":
+                names.append(f"{sample}.phased")
+    slot = {name: f"a{j}" for j, name in enumerate(names)}
+
+    lines = ["def bind(cols, filter_codes):"]
+    lines.append("    filter_code = filter_codes.setdefault")
+    lines += [f"    {slot[name]} = cols[{name!r}].append" for name in names]
+    lines += [
+        "    def extract(record):",
+        f"        {slot['chrom']}(record.chrom)",
+        f"        {slot['pos']}(record.pos)",
+        f"        {slot['id']}(record.id)",
+        f"        {slot['ref']}(record.ref)",
+        f"        {slot['alts']}(list(record.alts))",
+        f"        {slot['qual']}(record.qual)",
+        "        filters = tuple(record.filter.keys())",
+        f"        {slot['filters']}(filter_code(filters, len(filter_codes)))",
+        "        info = record.info",
+    ]
+    for name, is_flag, vector in info_spec:
+        a = slot[name]
+        if is_flag:
+            lines.append(f"        {a}(True if {name!r} in info else None)")
+            continue
+        # A membership test is much cheaper than catching the KeyError for an
+        # absent field (and VariantRecordInfo.get fails on those outright)
+        lines += [
+            f"        v = info[{name!r}] if {name!r} in info else None",
+            f"        {a}({_value_expr(vector)})",
+        ]
+    if not fmt_spec:
+        sample_spec = ()
+    if sample_spec:
+        lines.append("        samples = record.samples")
+    for i, sample in sample_spec:
+        lines.append(f"        s = samples[{i}]")
+        for key, vector in fmt_spec:
+            a = slot[f"{sample}.{key}"]
+            lines.append(f"        v = s[{key!r}] if {key!r} in s else None")
+            if key == "GT":
+                p = slot[f"{sample}.phased"]
+                lines += [
+                    "        if v is None:",
+                    f"            {a}(None)",
+                    f"            {p}(None)",
+                    "        else:",
+                    f"            {a}(list(v))",
+                    f"            {p}(s.phased)",
+                ]
+            else:
+                lines.append(f"        {a}({_value_expr(vector)})")
+    lines.append("    return extract")
+
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["bind"]
+
+
+def _iter_record_chunks(
+    f: pysam.VariantFile,
+    query: str | None,
+    info_fields: frozenset[str],
+    sample_fields: frozenset[str],
+    samples: frozenset[str],
     include_unspecified: bool,
-) -> list[dict[str, Any]]:
+    types: dict[str, pa.DataType],
+    info_is_vector: dict[str, bool],
+    info_flags: frozenset[str],
+    fmt_is_vector: dict[str, bool],
+    chunk_size: int = 65536,
+) -> Iterator[pa.RecordBatch]:
     if query is not None:
         record_iter = f.fetch(*bioframe.parse_region(query))
     else:
-        record_iter = f
-
-    records = []
-    for record in record_iter:
-        # Main fields
-        dct = {
-            "chrom": record.chrom,
-            "pos": record.pos,
-            "id": record.id,
-            "ref": record.ref,
-            "alts": list(record.alts),
-            "qual": record.qual,
-            "filters": list(record.filter.keys()),
-        }
-
-        # Info
-        for key, value in record.info.items():
-            if key in info_fields or include_unspecified:
-                if isinstance(value, tuple):
-                    dct[key] = list(value)
-                else:
-                    dct[key] = value
+        record_iter = iter(f)
+
+    names = list(MAIN_COLUMNS) + list(info_fields)
+    for sample in samples:
+        for key in sample_fields:
+            names.append(f"{sample}.{key}")
+            if key == "GT":
+                names.append(f"{sample}.phased")
 
-        # Samples
-        for sample, genotype in record.samples.items():
-            if sample in samples or include_unspecified:
-                for key, value in genotype.items():
-                    if key in sample_fields or include_unspecified:
-                        if key == "GT":
-                            dct[f"{sample}.GT"] = list(genotype[key])
-                            dct[f"{sample}.phased"] = genotype.phased
-                        elif isinstance(value, tuple):
-                            dct[f"{sample}.{key}"] = list(value)
-                        else:
-                            dct[f"{sample}.{key}"] = value
-        records.append(dct)
+    # Sample column names are built once rather than once per record. Names
+    # for unspecified samples or fields are added as they are encountered.
+    sample_field_names = {
+        (sample, key): f"{sample}.{key}"
+        for sample in samples
+        for key in sample_fields
+    }
+    phased_names = {sample: f"{sample}.phased" for sample in samples}
 
-    return records
+    # Samples are looked up by position, so the ones that weren't requested
+    # are never visited.
+    sample_positions = [
+        (i, sample)
+        for i, sample in enumerate(f.header.samples)
+        if sample in samples or include_unspecified
+    ]
+
+    # Without unspecified fields the set of columns is fixed up front, so a
+    # record extractor specialized to it can be used instead of the generic
+    # loop below.
+    bind_extractor = None
+    if not include_unspecified:
+        bind_extractor = _compile_record_extractor(
+            tuple(
+                (key, key in info_flags, info_is_vector.get(key))
+                for key in sorted(info_fields)
+            ),
+            tuple(sample_positions),
+            tuple(
+                (key, fmt_is_vector.get(key)) for key in sorted(sample_fields)
+            ),
+        )
+
+    def sample_field_name(sample, key):
+        name = sample_field_names.get((sample, key))
+        if name is None:
+            name = sample_field_names[sample, key] = f"{sample}.{key}"
+        return name
+
+    def phased_name(sample):
+        name = phased_names.get(sample)
+        if name is None:
+            name = phased_names[sample] = f"{sample}.phased"
+        return name
+
+    def append(key, value):
+        # Columns for unspecified fields are created on first sight and
+        # backfilled for the records that came before.
+        values = cols.get(key)
+        if values is None:
+            values = cols[key] = [None] * n
+        values.append(value)
+
+    # FILTER takes few distinct values, so each record only stores a code
+    # for its combination of filters. Codes are decoded once per chunk
+    # instead of converting a list of strings per record.
+    filter_codes = {}
+    filter_code = filter_codes.setdefault
+
+    # Records are converted to Arrow one chunk at a time, so only a chunk's
+    # worth of Python objects is alive at once.
+    first = True
+    while True:
+        cols = {name: [] for name in names}
+        append_chrom = cols["chrom"].append
+        append_pos = cols["pos"].append
+        append_id = cols["id"].append
+        append_ref = cols["ref"].append
+        append_alts = cols["alts"].append
+        append_qual = cols["qual"].append
+        append_filters = cols["filters"].append
+        all_columns = cols.values()
+
+        n = 0
+        if bind_extractor is not None:
+            extract = bind_extractor(cols, filter_codes)
+            for record in islice(record_iter, chunk_size):
+                extract(record)
+                n += 1
+            # Requested samples that aren't in the file
+            for values in all_columns:
+                if len(values) < n:
+                    values.extend([None] * (n - len(values)))
+        else:
+            for record in islice(record_iter, chunk_size):
+                # Main fields
+                append_chrom(record.chrom)
+                append_pos(record.pos)
+                append_id(record.id)
+                append_ref(record.ref)
+                append_alts(list(record.alts))
+                append_qual(record.qual)
+                filters = tuple(record.filter.keys())
+                append_filters(filter_code(filters, len(filter_codes)))
+
+                # Info. Whether a field holds a vector is known from the
+                # header, so only undeclared fields need their values
+                # inspected.
+                info = record.info
+                for key in info:
+                    if key in info_fields or include_unspecified:
+                        if key in info_flags:
+                            append(key, True)
+                            continue
+                        value = info[key]
+                        vector = info_is_vector.get(key)
+                        if vector is None:
+                            vector = isinstance(value, tuple)
+                        append(key, list(value) if vector else value)
+
+                # Samples
+                record_samples = record.samples
+                for i, sample in sample_positions:
+                    genotype = record_samples[i]
+                    for key in genotype:
+                        if key in sample_fields or include_unspecified:
+                            name = sample_field_name(sample, key)
+                            value = genotype[key]
+                            if key == "GT":
+                                append(name, list(value))
+                                append(phased_name(sample), genotype.phased)
+                                continue
+                            vector = fmt_is_vector.get(key)
+                            if vector is None:
+                                vector = isinstance(value, tuple)
+                            append(name, list(value) if vector else value)
+
+                # Fields missing from this record
+                n += 1
+                for values in all_columns:
+                    if len(values) < n:
+                        values.append(None)
+
+        if n == 0 and not first:
+            return
+        first = False
+        # Unspecified fields discovered in this chunk carry over to the next
+        names = list(cols)
+        cols["filters"] = pa.array(
+            [list(filters) for filters in filter_codes], types["filters"]
+        ).take(pa.array(cols["filters"], pa.int32()))
+        yield _columns_to_batch(cols, types)
+        if n < chunk_size:
+            return
+
+
+def _is_vector(number: int | str) -> bool:
+    # Number=0 (Flag) and Number=1 hold one value; A, G, R, "." and >1 a list
+    return str(number) not in ("0", "1")
+
+
+def dtype_for(name: str, number: int | str, type: str) -> str:
+    """
+    Get the numpy/pandas dtype for the values of a FORMAT field.
+
+    Parameters
+    ----------
+    name : str
+        FORMAT field name.
+    number : int or str
+        Number of values, as declared in the header.
+    type : str
+        Type, as declared in the header.
+
+    Returns
+    -------
+    str
+        The dtype of a single value. Fields with more than one value per
+        sample hold lists of this dtype.
+
+    Notes
+    -----
+    Allele indices in GT, as well as GQ and DP, use the narrower dtypes in
+    `FORMAT_INT_DTYPES`. Other Integer fields use int32, the width of VCF
+    integers.
+    """
+    if type == "Integer" or name == "GT":
+        return FORMAT_INT_DTYPES.get(name, TYPE_MAP["Integer"])
+    return TYPE_MAP[type]
+
+
+def _arrow_type(dtype: str, number: int | str) -> pa.DataType:
+    if dtype == "object":
+        arrow_type = pa.string()
+    else:
+        arrow_type = pa.from_numpy_dtype(np.dtype(dtype))
+    return pa.list_(arrow_type) if _is_vector(number) else arrow_type
+
+
+def _widen_type(arrow_type: pa.DataType) -> pa.DataType:
+    if pa.types.is_list(arrow_type):
+        return pa.list_(_widen_type(arrow_type.value_type))
+    if pa.types.is_integer(arrow_type):
+        return pa.from_numpy_dtype(np.dtype(TYPE_MAP["Integer"]))
+    return arrow_type
+
+
+def _arrow_types(
+    info_schema: pd.DataFrame,
+    sample_schema: pd.DataFrame,
+    samples: list[str],
+) -> dict[str, pa.DataType]:
+    types = {
+        "chrom": pa.string(),
+        "pos": pa.int64(),
+        "id": pa.string(),
+        "ref": pa.string(),
+        "alts": pa.list_(pa.string()),
+        "qual": pa.float64(),
+        "filters": pa.list_(pa.string()),
+    }
+    for row in info_schema.itertuples():
+        types[row.name] = _arrow_type(TYPE_MAP[row.type], row.number)
+    for row in sample_schema.itertuples():
+        if row.name == "GT":
+            arrow_type = _arrow_type(dtype_for(row.name, row.number, row.type), ".")
+        else:
+            arrow_type = _arrow_type(
+                dtype_for(row.name, row.number, row.type), row.number
+            )
+        for sample in samples:
+            types[f"{sample}.{row.name}"] = arrow_type
+            if row.name == "GT":
+                types[f"{sample}.phased"] = pa.bool_()
+    return types
+
+
+def _columns_to_batch(
+    cols: dict[str, list[Any]], types: dict[str, pa.DataType]
+) -> pa.RecordBatch:
+    arrays = []
+    for name, values in cols.items():
+        type_ = types.get(name)
+        try:
+            array = pa.array(values, type=type_)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            array = None
+        if array is None and type_ is not None and _widen_type(type_) != type_:
+            # Values too large for a narrow integer type
+            try:
+                array = pa.array(values, type=_widen_type(type_))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                pass
+        if array is None:
+            # Values that don't agree with the header are left to inference
+            array = pa.array(values)
+        if array.type != type_ and not pa.types.is_null(array.type):
+            # Keep the wider or inferred type for later chunks
+            types[name] = array.type
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, names=list(cols))
+
+
+def _concat_batches(batches: list[pa.RecordBatch]) -> pa.Table:
+    # Later batches may have gained columns for unspecified fields, so earlier
+    # ones are padded with nulls to the final schema. Columns that were widened
+    # in a later batch are cast to the wider type.
+    types = {}
+    for batch in batches:
+        for field in batch.schema:
+            if not pa.types.is_null(field.type):
+                types[field.name] = field.type
+    schema = pa.schema(
+        [
+            pa.field(name, types.get(name, pa.null()))
+            for name in batches[-1].schema.names
+        ]
+    )
+    padded = []
+    for batch in batches:
+        arrays = []
+        for field in schema:
+            if field.name in batch.schema.names:
+                array = batch.column(field.name)
+                if array.type != field.type:
+                    array = array.cast(field.type)
+            else:
+                array = pa.nulls(batch.num_rows, field.type)
+            arrays.append(array)
+        padded.append(pa.RecordBatch.from_arrays(arrays, schema=schema))
+    return pa.Table.from_batches(padded, schema=schema)
+
+
+def _read_vcf_with_htslib(
+    path: str,
+    query: str | None,
+    info_schema: pd.DataFrame,
+    sample_schema: pd.DataFrame,
+    info_fields: list[str],
+    sample_fields: list[str],
+    samples: list[str],
+    types: dict[str, pa.DataType],
+    decompression_threads: int,
+) -> pa.Table:
+    region = None
+    if query is not None:
+        chrom, start, end = bioframe.parse_region(query)
+        region = f"{chrom}:{start + 1}-{'' if end is None else end}"
+    cols = _read_vcf_chunk_c(
+        path,
+        region,
+        [
+            (row.name, row.number, row.type)
+            for row in info_schema.itertuples()
+            if row.name in info_fields
+        ],
+        [
+            (row.name, row.number, row.type)
+            for row in sample_schema.itertuples()
+            if row.name in sample_fields
+        ],
+        samples,
+        threads=decompression_threads,
+    )
+    return pa.Table.from_batches([_columns_to_batch(cols, types)])
+
+
+def _pack_genotypes(gt: pa.ListArray, phased: pa.Array) -> pa.Array | None:
+    # Diploid calls are packed into one byte: the allele indices go in bits
+    # 0-2 and 3-5 (7 for a missing allele) and bit 6 is the phasing flag.
+    # Other ploidies or allele indices above 6 can't be packed.
+    valid = gt.is_valid().to_numpy(zero_copy_only=False)
+    lengths = pc.list_value_length(gt).fill_null(2).to_numpy()
+    if (lengths != 2).any():
+        return None
+    alleles = pc.list_flatten(gt)
+    if len(alleles) and (pc.max(alleles).as_py() or 0) > 6:
+        return None
+    alleles = alleles.fill_null(7).to_numpy().astype(np.uint8).reshape(-1, 2)
+    is_phased = phased.fill_null(False).to_numpy(zero_copy_only=False)[valid]
+    packed = np.zeros(len(gt), dtype=np.uint8)
+    packed[valid] = alleles[:, 0] | alleles[:, 1] << 3 | is_phased.astype(np.uint8) << 6
+    return pa.array(packed, mask=~valid)
+
+
+def _prefetch(path: str) -> None:
+    # Ask the kernel to start reading the whole file into the page cache, so
+    # disk reads overlap with decompression and parsing instead of stalling
+    # them. posix_fadvise is only available on POSIX systems like Linux.
+    if not hasattr(os, "posix_fadvise") or not os.path.isfile(path):
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
+
+
+def _read_vcf_as_table(
+    path: str,
+    query: str | None,
+    info_fields: list[str] | None,
+    sample_fields: list[str] | None,
+    samples: list[str] | None,
+    include_unspecified: bool,
+    decompression_threads: int,
+    pack_genotypes: bool,
+    prefetch: bool,
+) -> pa.Table:
+    # A range query only reads part of the file
+    if prefetch and query is None:
+        _prefetch(path)
+
+    info_schema, sample_schema, all_samples = _cached_header(path)
+    all_samples = list(all_samples)
+
+    if info_fields is None:
+        info_fields = list(info_schema["name"])
+    if sample_fields is None:
+        sample_fields = list(sample_schema["name"])
+    if samples is None:
+        samples = all_samples
+
+    types = _arrow_types(info_schema, sample_schema, all_samples)
+    projection = _is_projection(
+        info_schema,
+        sample_schema,
+        info_fields,
+        sample_fields,
+        samples,
+        all_samples,
+        include_unspecified,
+    )
+    # oxbow's BCF reader can't be relied on (it fails on variable-length
+    # FORMAT fields), so BCFs go through htslib
+    use_oxbow = (
+        projection and os.path.exists(path) and not path.endswith(".bcf")
+    )
+    if use_oxbow and query is not None:
+        end = bioframe.parse_region(query)[2]
+        use_oxbow = end is None or end <= TABIX_MAX_END
+    if use_oxbow:
+        table = _read_vcf_with_oxbow(
+            path, query, info_fields, sample_fields, samples, types
+        )
+    elif projection and _read_vcf_chunk_c is not None:
+        # e.g. BCFs and remote URLs, which oxbow can't read but htslib can
+        table = _read_vcf_with_htslib(
+            path,
+            query,
+            info_schema,
+            sample_schema,
+            info_fields,
+            sample_fields,
+            samples,
+            types,
+            decompression_threads,
+        )
+    else:
+        with pysam.VariantFile(path, threads=decompression_threads) as f:
+            if not include_unspecified and not (sample_fields and samples):
+                # Sites-only read: htslib can skip parsing the FORMAT columns
+                f.subset_samples([])
+            batches = _iter_record_chunks(
+                f,
+                query,
+                frozenset(info_fields),
+                frozenset(sample_fields),
+                frozenset(samples),
+                include_unspecified,
+                types,
+                {
+                    row.name: _is_vector(row.number)
+                    for row in info_schema.itertuples()
+                },
+                frozenset(info_schema["name"][info_schema["type"] == "Flag"]),
+                {
+                    row.name: _is_vector(row.number)
+                    for row in sample_schema.itertuples()
+                },
+            )
+            table = _concat_batches(list(batches))
+
+    if pack_genotypes:
+        for name in table.column_names:
+            if name.endswith(".GT"):
+                phased = name[: -len("GT")] + "phased"
+                # Batches slice both columns at the same boundaries
+                packed = [
+                    _pack_genotypes(batch.column(0), batch.column(1))
+                    for batch in table.select([name, phased]).to_batches()
+                ]
+                if all(chunk is not None for chunk in packed):
+                    i = table.column_names.index(name)
+                    table = table.set_column(
+                        i, name, pa.chunked_array(packed, pa.uint8())
+                    )
+
+    columns = (
+        MAIN_COLUMNS
+        + info_fields
+        + [f"{sample}.{field}" for sample in samples
+           for field in [f"phased", *sample_fields]]
+    )
+    # Requested columns that no record had a value for are added as nulls,
+    # and unspecified ones found while reading go after the requested ones.
+    # The table is assembled in its final order once, since reordering or
+    # adding columns on a DataFrame copies it each time.
+    present = set(table.column_names)
+    expected = set(columns)
+    columns += [name for name in table.column_names if name not in expected]
+    return pa.Table.from_arrays(
+        [
+            table.column(name) if name in present else pa.nulls(len(table))
+            for name in columns
+        ],
+        names=columns,
+    )
 
 
 def read_info_schema(path: str):
     """
     Read the schema of the INFO column of a VCF.
 
-    This currently uses pysam.
+    This currently uses pysam. The parsed header is cached per path and
+    modification time, so repeated calls don't re-read the file.
 
     Parameters
     ----------
@@ -119,15 +832,15 @@ def read_info_schema(path: str):
     - A dot (".") - for fields where the number of values per VCF record
       varies, is unknown, or is unbounded.
     """
-    with pysam.VariantFile(path) as f:
-        return _read_info_schema(f)
+    return _cached_header(path)[0].copy()
 
 
 def read_sample_schema(path: str):
     """
     Read the schema of the genotype sample columns of a VCF.
 
-    This currently uses pysam.
+    This currently uses pysam. The parsed header is cached per path and
+    modification time, so repeated calls don't re-read the file.
 
     Parameters
     ----------
@@ -142,8 +855,7 @@ def read_sample_schema(path: str):
     -----
     Possible values for `type` are: "Integer", "Float", and "String".
     """
-    with pysam.VariantFile(path) as f:
-        return _read_sample_schema(f)
+    return _cached_header(path)[1].copy()
 
 
 def read_vcf_as_pandas(
@@ -153,6 +865,9 @@ def read_vcf_as_pandas(
     sample_fields: list[str] | None = None,
     samples: list[str] | None = None,
     include_unspecified: bool = False,
+    decompression_threads: int = DEFAULT_DECOMPRESSION_THREADS,
+    pack_genotypes: bool = False,
+    prefetch: bool = False,
 ) -> pd.DataFrame:
     """
     Read a VCF into a pandas dataframe, extracting INFO and sample genotype fields.
@@ -171,42 +886,152 @@ def read_vcf_as_pandas(
         all fields will be extracted.
     samples : list[str], optional
         List of samples to extract. If None, all samples will be extracted.
+    decompression_threads : int, optional
+        Number of htslib threads used to decompress BGZF blocks. This only
+        helps for bgzipped VCFs and BCFs; it has no effect on plain text VCFs
+        or when the file is read by oxbow.
+    pack_genotypes : bool, optional
+        If True, diploid GT columns are packed into one uint8 per call: bits
+        0-2 and 3-5 hold the allele indices (7 for a missing allele) and bit 6
+        is set for phased calls. GT columns with other ploidies or allele
+        indices above 6 are returned as lists.
+    prefetch : bool, optional
+        If True and no `query` is given, the kernel is asked to read the whole
+        file into the page cache ahead of parsing. This helps for large local
+        files on slow disks and is ignored on platforms without
+        `posix_fadvise` and for remote files.
 
     Returns
     -------
     pd.DataFrame
         Pandas DataFrame with columns corresponding to the requested fields.
+
+    Notes
+    -----
+    When `include_unspecified` is False and all the requested fields and
+    samples are declared in the header, records are read by oxbow directly
+    into Arrow. For BCFs and remote files, the compiled `_vcf_parse`
+    extension is used for this case if it is available. Otherwise, records
+    are read one by one with pysam.
+
+    oxbow reports some missing INFO and FORMAT values differently from pysam,
+    because it gives them the same null as a field the record doesn't have.
+    A String value of "." (e.g. INFO "SS=.") comes back as null rather than
+    ".", and a vector of missing values (e.g. INFO "AF=.") as null rather
+    than [None]. A missing haploid genotype (GT of ".") comes back as a null
+    GT and `phased` rather than [None] and True.
     """
+    table = _read_vcf_as_table(
+        path,
+        query,
+        info_fields,
+        sample_fields,
+        samples,
+        include_unspecified,
+        decompression_threads,
+        pack_genotypes,
+        prefetch,
+    )
+    df = table.to_pandas(self_destruct=True, split_blocks=True)
+
+    # Missing values in object columns are NaN rather than None. Other
+    # columns already use NaN, so only the object ones are touched.
+    objects = df.columns[df.dtypes == object]
+    df[objects] = df[objects].fillna(np.nan)
+    return df
+
+
+def _split_regions(path: str, n_regions: int) -> list[tuple[str, int, int | None]]:
     with pysam.VariantFile(path) as f:
-        info_schema = _read_info_schema(f)
-        sample_schema = _read_sample_schema(f)
-
-        if info_fields is None:
-            info_fields = list(info_schema["name"])
-        if sample_fields is None:
-            sample_fields = list(sample_schema["name"])
-        if samples is None:
-            samples = list(f.header.samples)
-
-        records = _read_vcf_as_records(
-            f, query, set(info_fields), set(sample_fields), samples, include_unspecified
-        )
+        if f.index is None:
+            raise ValueError(f"{path} has no .tbi/.csi index")
+        # Only contigs present in the index have records
+        lengths = {name: f.header.contigs[name].length for name in f.index}
 
-    df = pd.DataFrame.from_records(records)
+    target = max(1, -(-sum(n or 0 for n in lengths.values()) // n_regions))
+    regions = []
+    for chrom, length in lengths.items():
+        if length is None:
+            regions.append((chrom, 0, None))
+            continue
+        for start in range(0, length, target):
+            regions.append((chrom, start, min(start + target, length)))
+    return regions
 
-    columns = (
-        ["chrom", "pos", "id", "ref", "alts", "qual", "filters"]
-        + info_fields
-        + [f"{sample}.{field}" for sample in samples
-           for field in [f"phased", *sample_fields]]
-    )
-    columns = columns + list(set(df.columns) - set(columns))
 
-    for col in columns:
-        if col not in df.columns:
-            df[col] = pd.NA
+def _read_region_as_pandas(
+    path: str, region: tuple[str, int, int | None], kwargs: dict[str, Any]
+) -> pd.DataFrame:
+    chrom, start, end = region
+    query = chrom if end is None else f"{chrom}:{start}-{end}"
+    df = read_vcf_as_pandas(path, query=query, **kwargs)
+    if end is None:
+        return df
+    # A record that overlaps two regions is only kept in the one it starts in
+    return df[(df["pos"] > start) & (df["pos"] <= end)]
+
+
+def read_vcf_as_pandas_parallel(
+    path: str,
+    info_fields: list[str] | None = None,
+    sample_fields: list[str] | None = None,
+    samples: list[str] | None = None,
+    include_unspecified: bool = False,
+    n_workers: int | None = None,
+) -> pd.DataFrame:
+    """
+    Read a whole indexed VCF into a pandas dataframe using multiple processes.
+
+    The genome is split into regions that are read by `read_vcf_as_pandas`
+    in a process pool, and the results are concatenated.
+
+    Parameters
+    ----------
+    path : str
+        Path to a bgzipped and indexed (.tbi/.csi) VCF file.
+    info_fields : list[str], optional
+        List of fields to extract from the INFO column. If None, all fields
+        will be extracted.
+    sample_fields: list[str], optional
+        List of fields to extract from the sample genotype columns. If None,
+        all fields will be extracted.
+    samples : list[str], optional
+        List of samples to extract. If None, all samples will be extracted.
+    n_workers : int, optional
+        Number of worker processes. Defaults to the number of CPUs.
+
+    Returns
+    -------
+    pd.DataFrame
+        Pandas DataFrame with columns corresponding to the requested fields.
 
-    return df[columns].fillna(np.nan)
+    Notes
+    -----
+    Contigs are split into chunks using the contig lengths declared in the
+    header. Contigs without a declared length are read as a whole.
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    # Several regions per worker, so uneven variant density balances out
+    regions = _split_regions(path, 4 * n_workers)
+    kwargs = dict(
+        info_fields=info_fields,
+        sample_fields=sample_fields,
+        samples=samples,
+        include_unspecified=include_unspecified,
+        # The workers already use every CPU
+        decompression_threads=1,
+    )
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        dfs = list(
+            executor.map(
+                _read_region_as_pandas,
+                repeat(path),
+                regions,
+                repeat(kwargs),
+            )
+        )
+    return pd.concat(dfs, ignore_index=True)
 
 
 def read_vcf_as_polars(
@@ -216,6 +1041,9 @@ def read_vcf_as_polars(
     sample_fields: list[str] | None = None,
     samples: list[str] | None = None,
     include_unspecified: bool = False,
+    decompression_threads: int = DEFAULT_DECOMPRESSION_THREADS,
+    pack_genotypes: bool = False,
+    prefetch: bool = False,
 ) -> pd.DataFrame:
     """
     Read a VCF into a polars dataframe, extracting INFO and sample genotype fields.
@@ -234,40 +1062,54 @@ def read_vcf_as_polars(
         all fields will be extracted.
     samples : list[str], optional
         List of samples to extract. If None, all samples will be extracted.
+    decompression_threads : int, optional
+        Number of htslib threads used to decompress BGZF blocks. This only
+        helps for bgzipped VCFs and BCFs; it has no effect on plain text VCFs
+        or when the file is read by oxbow.
+    pack_genotypes : bool, optional
+        If True, diploid GT columns are packed into one uint8 per call: bits
+        0-2 and 3-5 hold the allele indices (7 for a missing allele) and bit 6
+        is set for phased calls. GT columns with other ploidies or allele
+        indices above 6 are returned as lists.
+    prefetch : bool, optional
+        If True and no `query` is given, the kernel is asked to read the whole
+        file into the page cache ahead of parsing. This helps for large local
+        files on slow disks and is ignored on platforms without
+        `posix_fadvise` and for remote files.
 
     Returns
     -------
     pl.DataFrame
         Polars DataFrame with columns corresponding to the requested fields.
-    """
-    with pysam.VariantFile(path) as f:
-        info_schema = _read_info_schema(f)
-        sample_schema = _read_sample_schema(f)
-
-        if info_fields is None:
-            info_fields = list(info_schema["name"])
-        if sample_fields is None:
-            sample_fields = list(sample_schema["name"])
-        if samples is None:
-            samples = list(f.header.samples)
-
-        records = _read_vcf_as_records(
-            f, query, set(info_fields), set(sample_fields), samples, include_unspecified
-        )
+        Columns keep the chunks they were read in; call `rechunk()` on the
+        result to make them contiguous.
 
-    df = pl.from_records(records)
+    Notes
+    -----
+    When `include_unspecified` is False and all the requested fields and
+    samples are declared in the header, records are read by oxbow directly
+    into Arrow. For BCFs and remote files, the compiled `_vcf_parse`
+    extension is used for this case if it is available. Otherwise, records
+    are read one by one with pysam.
 
-    columns = (
-        ["chrom", "pos", "id", "ref", "alts", "qual", "filters"]
-        + info_fields
-        + [f"{sample}.{field}" for sample in samples
-           for field in [f"phased", *sample_fields]]
+    oxbow reports some missing INFO and FORMAT values differently from pysam,
+    because it gives them the same null as a field the record doesn't have.
+    A String value of "." (e.g. INFO "SS=.") comes back as null rather than
+    ".", and a vector of missing values (e.g. INFO "AF=.") as null rather
+    than [None]. A missing haploid genotype (GT of ".") comes back as a null
+    GT and `phased` rather than [None] and True.
+    """
+    table = _read_vcf_as_table(
+        path,
+        query,
+        info_fields,
+        sample_fields,
+        samples,
+        include_unspecified,
+        decompression_threads,
+        pack_genotypes,
+        prefetch,
     )
-    columns = columns + list(set(df.columns) - set(columns))
-
-    for col in columns:
-        if col not in df.columns:
-            df = df.with_columns(pl.lit(None).alias(col))
-
-    return df.select(columns)
-    # return df[columns].fillna(np.nan)
+    # Arrow buffers are shared with polars instead of being copied into
+    # contiguous columns
+    return pl.from_arrow(table, rechunk=False)